@@ -1,16 +1,19 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from src.db.main import init_db
+from src.db.main import init_db, warm_pool
 from src.router import router
-from fastapi.responses import JSONResponse
+from src.http_client import create_http_client
+from fastapi.responses import ORJSONResponse
 from fastapi import HTTPException
 
 
 @asynccontextmanager
 async def life_span(app: FastAPI):
     print("🚀 Starting up...")
+    app.state.http_client = create_http_client()
     try:
         await init_db()
+        await warm_pool()
         print("✅ Startup complete!")
     except Exception as e:
         print(f"❌ Startup failed: {e}")
@@ -18,12 +21,14 @@ async def life_span(app: FastAPI):
         # This allows you to see error messages
     yield
     print("🛑 Shutting down...")
+    await app.state.http_client.aclose()
 
 
 app = FastAPI(
     title="Country Currency & Exchange API",
     description="RESTful API for country data with exchange rates",
     lifespan=life_span,
+    default_response_class=ORJSONResponse,
 )
 app.include_router(router)
 
@@ -31,18 +36,25 @@ app.include_router(router)
 # Global exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(status_code=exc.status_code, content={"error": exc.detail})
+    return ORJSONResponse(status_code=exc.status_code, content={"error": exc.detail})
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    return JSONResponse(status_code=500, content={"error": "Internal server error"})
+    return ORJSONResponse(status_code=500, content={"error": "Internal server error"})
 
 
 if __name__ == "__main__":
     import uvicorn
     import os
-    from src import app 
 
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Single process: the response cache lives in memory and is only
+    # invalidated in the process that handles a refresh or delete
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="httptools",
+    )
\ No newline at end of file
@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from src.config import config
+
+
+class ResponseCache:
+    """In-memory LRU cache for GET responses, cleared whenever country data changes"""
+
+    def __init__(self, max_age: int, max_entries: int):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        # Bumped on every clear(); readers pass the value they started with to
+        # set() so results read before a write are never cached after it
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            # Entry is stale, drop it
+            self._entries.pop(key, None)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if generation != self.generation:
+            # Data changed while this value was being read, it may be stale
+            return
+
+        self._entries[key] = (time.monotonic() + self.max_age, value)
+        self._entries.move_to_end(key)
+
+        # Evict least recently used entries beyond the size cap
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+
+
+response_cache = ResponseCache(
+    config.RESPONSE_CACHE_MAX_AGE, config.RESPONSE_CACHE_MAX_ENTRIES
+)
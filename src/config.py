@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -7,6 +8,13 @@ class Settings(BaseSettings):
     EXCHANGE_RATE_API_URL: str
     CACHE_DIR: str = "cache"
     TIMEOUT: int
+    RESPONSE_CACHE_MAX_AGE: int = 300
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256
+    GDP_RANDOM_SEED: Optional[int] = None
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
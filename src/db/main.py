@@ -1,21 +1,24 @@
 from sqlmodel import SQLModel, create_engine, text
 from sqlalchemy.ext.asyncio import AsyncEngine
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from src.config import config
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import sessionmaker
 import asyncio
 
 # Create async engine properly
 engine = create_async_engine(
     config.DATABASE_URL,
-    echo=True,
+    echo=config.DB_ECHO,
     pool_pre_ping=True,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_recycle=config.DB_POOL_RECYCLE,
+    pool_use_lifo=True,
 )
 
 # Create async session maker
-async_session_maker = sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
+async_session_maker = async_sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
 )
 
 
@@ -35,6 +38,26 @@ async def init_db():
         print(f"❌ Database initialization failed: {e}")
         raise
 
+# Open pool_size connections up front so the first requests don't pay for them
+async def warm_pool():
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(config.DB_POOL_SIZE)),
+        return_exceptions=True,
+    )
+    connections = [r for r in results if not isinstance(r, BaseException)]
+    try:
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            raise failures[0]
+
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+        print(f"✅ Warmed {len(connections)} database connections")
+    finally:
+        # Closing returns the connections to the pool, they stay open.
+        # Close every one that opened, even if others failed
+        await asyncio.gather(
+            *(conn.close() for conn in connections), return_exceptions=True
+        )
 
 
 # Dependency to get DB session
@@ -0,0 +1,16 @@
+import httpx
+from fastapi import Request
+from src.config import config
+
+
+# Create the shared HTTP client used for all external API calls
+def create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=config.TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
+
+
+# Dependency to get the shared HTTP client
+async def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
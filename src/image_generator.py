@@ -1,11 +1,58 @@
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime, timezone
 import os
+import tempfile
+
+# Image dimensions
+WIDTH = 800
+HEIGHT = 600
+
+# Colors
+TITLE_COLOR = (25, 25, 112)  # Midnight blue
+HEADER_COLOR = (70, 130, 180)  # Steel blue
+TEXT_COLOR = (50, 50, 50)  # Dark gray
+BORDER_COLOR = (200, 200, 200)  # Light gray
+
+
+def _load_fonts() -> dict:
+    """Load fonts once, falling back to the default font if not available"""
+    try:
+        return {
+            "title": ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 32),
+            "header": ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24),
+            "text": ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18),
+            "small": ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14),
+        }
+    except OSError:
+        default_font = ImageFont.load_default()
+        return {"title": default_font, "header": default_font, "text": default_font, "small": default_font}
+
+
+def _build_template() -> Image.Image:
+    """Render the static parts of the summary image (border, title, headers)"""
+    image = Image.new('RGB', (WIDTH, HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+
+    # Draw border
+    draw.rectangle([10, 10, WIDTH-10, HEIGHT-10], outline=BORDER_COLOR, width=3)
+
+    # Title
+    draw.text((50, 40), "Country Data Summary", fill=TITLE_COLOR, font=_FONTS["title"])
+
+    # Top 5 countries header
+    draw.text((50, 160), "Top 5 Countries by Estimated GDP:", fill=HEADER_COLOR, font=_FONTS["header"])
+
+    return image
+
+
+_FONTS = _load_fonts()
+_TEMPLATE = _build_template()
+
 
 def generate_summary_image(total_countries: int, top_countries: list, cache_dir: str = "cache"):
     """
     Generate a summary image with country statistics.
-    
+
     Args:
         total_countries: Total number of countries in database
         top_countries: List of tuples (name, estimated_gdp)
@@ -13,47 +60,15 @@ def generate_summary_image(total_countries: int, top_countries: list, cache_dir:
     """
     # Create cache directory if it doesn't exist
     os.makedirs(cache_dir, exist_ok=True)
-    
-    # Image dimensions
-    width = 800
-    height = 600
-    
-    # Create image with white background
-    image = Image.new('RGB', (width, height), 'white')
+
+    # Start from the pre-rendered template and only draw the dynamic text
+    image = _TEMPLATE.copy()
     draw = ImageDraw.Draw(image)
-    
-    # Try to use a better font, fall back to default if not available
-    try:
-        title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 32)
-        header_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-        text_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
-        small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-    except:
-        title_font = ImageFont.load_default()
-        header_font = ImageFont.load_default()
-        text_font = ImageFont.load_default()
-        small_font = ImageFont.load_default()
-    
-    # Colors
-    title_color = (25, 25, 112)  # Midnight blue
-    header_color = (70, 130, 180)  # Steel blue
-    text_color = (50, 50, 50)  # Dark gray
-    border_color = (200, 200, 200)  # Light gray
-    
-    # Draw border
-    draw.rectangle([10, 10, width-10, height-10], outline=border_color, width=3)
-    
-    # Title
-    title = "Country Data Summary"
-    draw.text((50, 40), title, fill=title_color, font=title_font)
-    
+
     # Total countries
     total_text = f"Total Countries: {total_countries}"
-    draw.text((50, 100), total_text, fill=text_color, font=header_font)
-    
-    # Top 5 countries header
-    draw.text((50, 160), "Top 5 Countries by Estimated GDP:", fill=header_color, font=header_font)
-    
+    draw.text((50, 100), total_text, fill=TEXT_COLOR, font=_FONTS["header"])
+
     # Draw top countries
     y_position = 210
     for idx, (name, gdp) in enumerate(top_countries, 1):
@@ -61,18 +76,26 @@ def generate_summary_image(total_countries: int, top_countries: list, cache_dir:
             gdp_formatted = f"${gdp:,.2f}"
         else:
             gdp_formatted = "N/A"
-        
+
         country_text = f"{idx}. {name}: {gdp_formatted}"
-        draw.text((70, y_position), country_text, fill=text_color, font=text_font)
+        draw.text((70, y_position), country_text, fill=TEXT_COLOR, font=_FONTS["text"])
         y_position += 40
-    
+
     # Timestamp
     timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
     timestamp_text = f"Last Refreshed: {timestamp}"
-    draw.text((50, height - 60), timestamp_text, fill=text_color, font=small_font)
-    
-    # Save image
+    draw.text((50, HEIGHT - 60), timestamp_text, fill=TEXT_COLOR, font=_FONTS["small"])
+
+    # Save to a temp file and swap it in, so readers never see a partial PNG.
+    # Light compression keeps encoding cheap
     image_path = os.path.join(cache_dir, "summary.png")
-    image.save(image_path)
-    
-    return image_path
\ No newline at end of file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".png.tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            image.save(tmp_file, format="PNG", optimize=False, compress_level=1)
+        os.replace(tmp_path, image_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return image_path
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, func
 from datetime import datetime
 from typing import Optional
 
@@ -33,3 +34,15 @@ class Country(SQLModel, table=True):
 
     def __repr__(self):
         return f"<Country(id={self.id}, name={self.name}, currency={self.currency_code})>"
+
+
+# Case-insensitive lookups by name (func.lower(Country.name) == ...) hit this index
+Index("ix_countries_lower_name", func.lower(Country.name), unique=True)
+
+# Top countries by GDP for the summary image read the head of this index
+Index("ix_countries_gdp_desc", Country.estimated_gdp.desc())
+
+# Case-insensitive region and currency filters in get_countries
+# (functional indexes, MySQL 8.0.13+)
+Index("ix_countries_region_lower", func.lower(Country.region))
+Index("ix_countries_currency_lower", func.lower(Country.currency_code))
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, FastAPI, Depends
+from fastapi import APIRouter, HTTPException, FastAPI, Depends, Request
 from fastapi.params import Query
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 from src.schemas import RefreshResponse, StatusResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.main import get_session
+from src.http_client import get_http_client
 from src.services import CountryService
+from src.cache import response_cache
 from typing import Optional
+import httpx
 import os
 from src.config import config
+import asyncio
 
 
 
@@ -15,6 +19,35 @@ from src.config import config
 
 router = APIRouter()
 
+# Seconds clients may reuse the summary image before revalidating its ETag
+IMAGE_MAX_AGE = 3600
+
+
+def read_image_with_etag(image_path: str) -> tuple:
+    """Read an image file and return (etag, bytes), blocking, run it in a thread"""
+    with open(image_path, "rb") as image_file:
+        # The image only changes on refresh, so its mtime identifies the version
+        mtime_ns = os.fstat(image_file.fileno()).st_mtime_ns
+        return f'"{mtime_ns}"', image_file.read()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (list, weak tags or *) against an ETag"""
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
 
 @router.get("/", response_model=dict, tags=["Root"])
 async def root():
@@ -33,12 +66,15 @@ async def root():
 
 #  Endpoint to refresh countries data
 @router.post("/countries/refresh", response_model=RefreshResponse, tags=["Countries"])
-async def refresh_countries(db: AsyncSession = Depends(get_session)):
+async def refresh_countries(
+    db: AsyncSession = Depends(get_session),
+    client: httpx.AsyncClient = Depends(get_http_client),
+):
     """Refresh countries data by delegating to CountryService instance."""
     service = CountryService()
 
     try:
-        total_countries, updated, inserted = await service.refresh_countries(db)
+        total_countries, updated, inserted = await service.refresh_countries(db, client)
 
         # Get latest refresh timestamp
         status = await service.get_status(db)
@@ -76,6 +112,10 @@ async def refresh_countries(db: AsyncSession = Depends(get_session)):
         # Generic server error
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    finally:
+        # The upsert may have committed even if a later step (e.g. the image) failed
+        response_cache.clear()
+
 
 @router.get("/countries", response_model=list[dict], tags=["Countries"])
 async def get_countries(
@@ -91,36 +131,57 @@ async def get_countries(
     ),
     db: AsyncSession = Depends(get_session),
 ):
-    ser = CountryService()
-    countries = await ser.get_countries(db, region, currency, sort)
+    # Key on the normalized filters so arbitrary query strings don't add entries
+    cache_key = (
+        "countries",
+        region.lower() if region else None,
+        currency.lower() if currency else None,
+        sort.lower() if sort else None,
+    )
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # Convert each SQLAlchemy model instance to dict
-    countries_list = [country.__dict__ for country in countries]
-    # Remove SQLAlchemy internal key
-    for c in countries_list:
-        c.pop("_sa_instance_state", None)
+    generation = response_cache.generation
+    ser = CountryService()
+    countries_list = await ser.get_countries(db, region, currency, sort)
 
+    response_cache.set(cache_key, countries_list, generation)
     return countries_list
 
 
 @router.get("/countries/image", tags=["Image"])
-async def get_summary_image(db: AsyncSession = Depends(get_session),):
-    ser = CountryService()
-    await ser.generate_summary_image_if_missing(db)
-    cache_dir = config.CACHE_DIR
-    image_path = os.path.join(cache_dir, 'summary.png')
-    
-    if not os.path.exists(image_path):
-        raise HTTPException(
-            status_code=404,
-            detail="Summary image not found"
-        )
-    
-    return FileResponse(
-        image_path,
-        media_type="image/png",
-        filename="summary.png"
-    )
+async def get_summary_image(request: Request, db: AsyncSession = Depends(get_session),):
+    cached = response_cache.get("summary.png")
+
+    if cached is None:
+        generation = response_cache.generation
+        ser = CountryService()
+        await ser.generate_summary_image_if_missing(db)
+        cache_dir = config.CACHE_DIR
+        image_path = os.path.join(cache_dir, 'summary.png')
+
+        try:
+            cached = await asyncio.to_thread(read_image_with_etag, image_path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=404,
+                detail="Summary image not found"
+            )
+
+        response_cache.set("summary.png", cached, generation)
+
+    etag, image_bytes = cached
+    image_headers = {
+        "Cache-Control": f"public, max-age={IMAGE_MAX_AGE}",
+        "ETag": etag,
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=image_headers)
+
+    image_headers["Content-Disposition"] = 'attachment; filename="summary.png"'
+    return Response(image_bytes, media_type="image/png", headers=image_headers)
 
 
 @router.get("/countries/{name}", response_model=dict, tags=["Countries"])
@@ -128,6 +189,12 @@ async def get_country_by_name(
     name: str,
     db: AsyncSession = Depends(get_session)
 ):
+    cache_key = ("country", name.lower())
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = response_cache.generation
     ser = CountryService()
     country = await ser.get_country_by_name(db, name)  # async version
 
@@ -141,6 +208,7 @@ async def get_country_by_name(
     country_dict = country.__dict__.copy()
     country_dict.pop("_sa_instance_state", None)
 
+    response_cache.set(cache_key, country_dict, generation)
     return country_dict
 
 
@@ -158,13 +226,23 @@ async def delete_country(
             detail="Country not found"
         )
 
+    response_cache.clear()
+
     return {"message": f"Country '{name}' deleted successfully"}
 
 
 @router.get("/status", response_model=StatusResponse, tags=["Status"])
-async def get_status( db: AsyncSession = Depends(get_session)):
+async def get_status(db: AsyncSession = Depends(get_session)):
+    cached = response_cache.get("status")
+    if cached is not None:
+        return cached
+
+    generation = response_cache.generation
     ser = CountryService()
     status = await ser.get_status(db)
-    return StatusResponse(**status)
+    status_response = StatusResponse(**status)
+
+    response_cache.set("status", status_response, generation)
+    return status_response
 
 
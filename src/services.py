@@ -1,7 +1,12 @@
+import asyncio
+import heapq
 import httpx
+import orjson
 import random
+import struct
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from src.models import Country
 from datetime import datetime
 from src.config import config
@@ -10,33 +15,48 @@ from src.image_generator import generate_summary_image
 import os
 
 
+# Columns overwritten when a refreshed country already exists
+UPSERT_COLUMNS = (
+    "capital",
+    "region",
+    "population",
+    "currency_code",
+    "exchange_rate",
+    "estimated_gdp",
+    "flag_url",
+    "last_refreshed_at",
+)
+
+# Shared across services (one is built per request), so each refresh
+# continues the sequence instead of restarting it from the seed
+gdp_rng = random.Random(config.GDP_RANDOM_SEED)
+
+
 class CountryService:
 
     def __init__(self):
         self.countries_api_url = config.COUNTRIES_API_URL
         self.exchange_rate_api_url = config.EXCHANGE_RATE_API_URL
         self.cache_dir = config.CACHE_DIR
-        self.timeout = config.TIMEOUT  # type: float
+        self.rng = gdp_rng
 
-    async def fetch_countries_data(self) -> list:
+    async def fetch_countries_data(self, client: httpx.AsyncClient) -> list:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.countries_api_url)
-                response.raise_for_status()
-                return response.json()
+            response = await client.get(self.countries_api_url)
+            response.raise_for_status()
+            return orjson.loads(response.content)
         except httpx.TimeoutException:
             raise Exception("Countries API request timed out")
         except httpx.HTTPError as e:
             raise Exception(f"Could not fetch data from Countries API: {str(e)}")
 
-    async def fetch_exchange_rates(self) -> dict:
+    async def fetch_exchange_rates(self, client: httpx.AsyncClient) -> dict:
         """Fetch exchange rates from external API"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.exchange_rate_api_url)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("rates", {})
+            response = await client.get(self.exchange_rate_api_url)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            return data.get("rates", {})
         except httpx.TimeoutException:
             raise Exception("Exchange Rate API request timed out")
         except httpx.HTTPError as e:
@@ -57,20 +77,21 @@ class CountryService:
 
         return None
 
-    def calculate_estimated_gdp(
-        self, population: int, exchange_rate: Optional[float]
-    ) -> Optional[float]:
-        """Calculate estimated GDP based on population and exchange rate"""
-        if exchange_rate is None or exchange_rate == 0:
-            return None
-
-        # Generate random multiplier between 1000 and 2000
-        multiplier = random.uniform(1000, 2000)
+    def calculate_estimated_gdps(
+        self, populations: List[int], exchange_rates: List[float]
+    ) -> List[float]:
+        """Calculate estimated GDP for a batch of countries in a single pass"""
+        # Generate one random multiplier between 1000 and 2000 per country
+        uniform = self.rng.uniform
+        multipliers = [uniform(1000, 2000) for _ in populations]
 
         # Calculate: population × multiplier ÷ exchange_rate
-        estimated_gdp = (population * multiplier) / exchange_rate
-
-        return estimated_gdp
+        return [
+            (population * multiplier) / exchange_rate
+            for population, multiplier, exchange_rate in zip(
+                populations, multipliers, exchange_rates
+            )
+        ]
 
     def process_country_data(self, country_data: dict, exchange_rates: dict) -> dict:
         """Process a single country's data"""
@@ -90,15 +111,10 @@ class CountryService:
             exchange_rate = None
             estimated_gdp = 0.0
         else:
-            # Get exchange rate for this currency
+            # Get exchange rate for this currency. GDP is left empty here and
+            # filled in for the whole batch by calculate_estimated_gdps
             exchange_rate = exchange_rates.get(currency_code)
-
-            if exchange_rate is None:
-                # Currency code not found in exchange rates
-                estimated_gdp = None
-            else:
-                # Calculate GDP
-                estimated_gdp = self.calculate_estimated_gdp(population, exchange_rate)
+            estimated_gdp = None
 
         return {
             "name": name,
@@ -113,13 +129,24 @@ class CountryService:
         }
 
     #
-    async def refresh_countries(self, db: AsyncSession) -> Tuple[int, int, int]:
-        # Fetch data from external APIs
-        countries_data = await self.fetch_countries_data()
-        exchange_rates = await self.fetch_exchange_rates()
+    async def refresh_countries(
+        self, db: AsyncSession, client: httpx.AsyncClient
+    ) -> Tuple[int, int, int]:
+        # Fetch data from both external APIs concurrently over the shared client
+        countries_data, exchange_rates = await asyncio.gather(
+            self.fetch_countries_data(client),
+            self.fetch_exchange_rates(client),
+        )
 
         updated_count = 0
         inserted_count = 0
+        refreshed_at = datetime.utcnow()
+        rows = []
+
+        # Names already stored, so the upsert can be split into updated/inserted counts
+        existing_q = select(Country.name)
+        existing_result = await db.exec(existing_q)
+        existing_names = {name.lower() for name in existing_result.scalars().all()}
 
         # Process each country
         for country_data in countries_data:
@@ -127,61 +154,79 @@ class CountryService:
                 # Extract and process country data
                 processed_data = self.process_country_data(country_data, exchange_rates)
 
-                # Extract currency code using your existing method
-                currency_code = self.extract_currency_code(
-                    country_data.get("currencies", [])
-                )
-                processed_data["currency_code"] = currency_code
-
-                # Get the exchange rate for this currency
-                if currency_code and exchange_rates.get(currency_code):
-                    processed_data["exchange_rate"] = exchange_rates[currency_code]
-                else:
-                    processed_data["exchange_rate"] = None
-
                 # Validate required fields
                 if not processed_data["name"] or processed_data["population"] is None:
                     continue
 
-                # Check if country exists (case-insensitive) using async query
-                q = select(Country).where(
-                    func.lower(Country.name) == func.lower(processed_data["name"])
-                )
-                result = await db.exec(q)
-                existing_country = result.scalars().first()
-
-                if existing_country:
-                    # Update existing country
-                    for key, value in processed_data.items():
-                        setattr(existing_country, key, value)
-                    existing_country.last_refreshed_at = datetime.utcnow()
+                processed_data["last_refreshed_at"] = refreshed_at
+                rows.append(processed_data)
+
+                name_key = processed_data["name"].lower()
+                if name_key in existing_names:
                     updated_count += 1
                 else:
-                    # Insert new country
-                    new_country = Country(**processed_data)
-                    db.add(new_country)
+                    existing_names.add(name_key)
                     inserted_count += 1
 
             except Exception as e:
                 print(f"Error processing country: {str(e)}")
                 continue
 
+        # Calculate GDP for every country with a usable exchange rate at once
+        priced_rows = [row for row in rows if row["exchange_rate"]]
+        estimated_gdps = self.calculate_estimated_gdps(
+            [row["population"] for row in priced_rows],
+            [row["exchange_rate"] for row in priced_rows],
+        )
+        for row, estimated_gdp in zip(priced_rows, estimated_gdps):
+            row["estimated_gdp"] = estimated_gdp
+
+        # Insert or update every country in a single statement
+        if rows:
+            upsert_q = mysql_insert(Country).values(rows)
+            upsert_q = upsert_q.on_duplicate_key_update(
+                {column: upsert_q.inserted[column] for column in UPSERT_COLUMNS}
+            )
+            await db.exec(upsert_q)
+
         # Commit all changes
         await db.commit()
 
-        # Generate summary image
-        await self.generate_summary(db)
-
         # Get total countries (async)
         total_q = select(func.count()).select_from(Country)
         total_result = await db.exec(total_q)
         total_countries = total_result.scalar_one() if total_result is not None else 0
 
+        # Generate summary image from the rows already in memory. A repeated
+        # name is upserted once with its last row, so count it the same way
+        refreshed_rows = {row["name"].lower(): row for row in rows}
+        top_countries = heapq.nlargest(
+            5,
+            (
+                (row["name"], self.as_stored_float(row["estimated_gdp"]))
+                for row in refreshed_rows.values()
+                if row["estimated_gdp"] is not None
+            ),
+            key=lambda country: country[1],
+        )
+        await self.generate_summary(len(refreshed_rows), top_countries)
+
         return total_countries, updated_count, inserted_count
 
+    def as_stored_float(self, value: float) -> float:
+        """Round a float to the single precision of the MySQL FLOAT column"""
+        return struct.unpack("f", struct.pack("f", value))[0]
+
     # Generate summary image
-    async def generate_summary(self, db: AsyncSession):
-        """Generate summary image with top countries"""
+    async def generate_summary(self, total_countries: int, top_countries: list):
+        """Generate summary image from the total and (name, gdp) top countries"""
+        # Generate image off the event loop, Pillow rendering is blocking
+        await asyncio.to_thread(
+            generate_summary_image, total_countries, top_countries, self.cache_dir
+        )
+
+    async def generate_summary_from_db(self, db: AsyncSession):
+        """Generate summary image with top countries queried from the database"""
         # Get total countries
         total_q = select(func.count()).select_from(Country)
         total_result = await db.exec(total_q)
@@ -200,15 +245,7 @@ class CountryService:
         top_countries_rows = top_result.all()
         top_countries = [(r[0], r[1]) for r in top_countries_rows]
 
-        # Generate image
-        generate_summary_image(total_countries, top_countries, self.cache_dir)
-
-    async def get_status(self, db: AsyncSession) -> dict:
-        """Return status info such as last_refreshed_at."""
-        q = select(func.max(Country.last_refreshed_at))
-        result = await db.exec(q)
-        last_refreshed = result.scalar()
-        return {"last_refreshed_at": last_refreshed}
+        await self.generate_summary(total_countries, top_countries)
 
     async def get_countries(
         self,
@@ -216,10 +253,22 @@ class CountryService:
         region: Optional[str] = None,
         currency: Optional[str] = None,
         sort: Optional[str] = None,
-    ) -> List[Country]:
+    ) -> List[dict]:
         """Return list of countries applying filters and sorting (async)."""
 
-        statement = select(Country)
+        # Select plain columns so rows come back as mappings, not ORM objects
+        statement = select(
+            Country.id,
+            Country.name,
+            Country.capital,
+            Country.region,
+            Country.population,
+            Country.currency_code,
+            Country.exchange_rate,
+            Country.estimated_gdp,
+            Country.flag_url,
+            Country.last_refreshed_at,
+        )
 
         # Apply filters
         if region:
@@ -248,8 +297,7 @@ class CountryService:
             statement = statement.order_by(Country.name.asc())
 
         result = await db.exec(statement)
-        countries = result.scalars().all()
-        return countries
+        return [dict(row) for row in result.mappings().all()]
 
 
     async def get_country_by_name(self, db: AsyncSession, country_name: str) -> Optional[Country]:
@@ -292,9 +340,8 @@ class CountryService:
 
 
     async def generate_summary_image_if_missing(self, db: AsyncSession):
-        if not os.path.exists(config.CACHE_DIR):
-            os.makedirs(config.CACHE_DIR)
+        await asyncio.to_thread(os.makedirs, config.CACHE_DIR, exist_ok=True)
         image_path = os.path.join(config.CACHE_DIR, "summary.png")
-        if not os.path.exists(image_path):
+        if not await asyncio.to_thread(os.path.exists, image_path):
             # Call your image generation function here
-          await self.generate_summary(db)
\ No newline at end of file
+            await self.generate_summary_from_db(db)
\ No newline at end of file